@@ -5,12 +5,80 @@ Takes a time, day of week, and list of places, returns which places are open.
 """
 
 import json
+import os
 import re
 from datetime import datetime, time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import argparse
 import sys
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
+
+try:
+    import numpy as np
+    from numba import njit, prange
+except ImportError:  # numpy/numba are optional; fall back to the pure-Python scan
+    np = None
+    njit = None
+
+# Use the parallel scan kernel above this many places; below it the
+# thread fork/join overhead outweighs the per-place work
+PARALLEL_THRESHOLD = 10_000
+
+# Days encoded 0-6 (Monday=0) for the array-based scan
+DAY_NAMES = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+DAY_INDEX = {name: i for i, name in enumerate(DAY_NAMES)}
+
+# Compiled once at import time so per-call parsing skips the re-cache lookup
+TIME_AMPM_PATTERN = re.compile(r"(\d{1,2}):(\d{2})\s*(AM|PM)")
+TIME_24H_PATTERN = re.compile(r"(\d{1,2}):(\d{2})")
+# Matches: "6:00 AM – 2:00 PM" or the halves of "11:00 AM – 3:00 PM, 5:00 – 10:00 PM"
+TIME_RANGE_PATTERN = re.compile(
+    r"(\d{1,2}:\d{2}\s*(?:AM|PM)?)\s*[–-]\s*(\d{1,2}:\d{2}\s*(?:AM|PM)?)"
+)
+
+
+def to_minutes(value: Union[time, int]) -> int:
+    """Normalize a datetime.time or minutes-since-midnight int to an int."""
+    if isinstance(value, int):
+        return value
+    return value.hour * 60 + value.minute
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _scan_open_places(offsets, day_idx, start, end, q_day, q_minutes, out):
+        """Mark places with a range covering the queried day and minute."""
+        for p in range(out.shape[0]):
+            for k in range(offsets[p], offsets[p + 1]):
+                if day_idx[k] == q_day and start[k] <= q_minutes <= end[k]:
+                    out[p] = True
+                    break
+
+    @njit(parallel=True, cache=True)
+    def _scan_open_places_parallel(
+        offsets, day_idx, start, end, q_day, q_minutes, out
+    ):
+        """Parallel variant: each place's ranges are contiguous, so places
+        can be scanned independently across threads."""
+        for p in prange(out.shape[0]):
+            for k in range(offsets[p], offsets[p + 1]):
+                if day_idx[k] == q_day and start[k] <= q_minutes <= end[k]:
+                    out[p] = True
+                    break
+
 
 class PlaceHoursFilter:
     """Class to handle filtering places by operating hours."""
@@ -34,14 +102,14 @@ class PlaceHoursFilter:
             "sun": "Sunday",
         }
 
-    def parse_time(self, time_str: str) -> time:
-        """Parse time string in various formats to time object."""
+    def parse_time(self, time_str: str) -> int:
+        """Parse time string in various formats to minutes since midnight."""
         time_str = time_str.strip().upper()
 
         # Handle different time formats
         if "AM" in time_str or "PM" in time_str:
             # Format: "6:00 AM", "2:00 PM", etc.
-            time_match = re.search(r"(\d{1,2}):(\d{2})\s*(AM|PM)", time_str)
+            time_match = TIME_AMPM_PATTERN.search(time_str)
             if time_match:
                 hour = int(time_match.group(1))
                 minute = int(time_match.group(2))
@@ -52,14 +120,23 @@ class PlaceHoursFilter:
                 elif period == "PM" and hour != 12:
                     hour += 12
 
-                return time(hour, minute)
+                # datetime.time used to enforce these bounds; keep malformed
+                # input ("13:00 PM", "9:75 AM") failing loudly
+                if hour > 23 or minute > 59:
+                    raise ValueError(f"Time out of range: {time_str}")
+
+                return hour * 60 + minute
         else:
             # Format: "14:30", "6:00", etc.
-            time_match = re.search(r"(\d{1,2}):(\d{2})", time_str)
+            time_match = TIME_24H_PATTERN.search(time_str)
             if time_match:
                 hour = int(time_match.group(1))
                 minute = int(time_match.group(2))
-                return time(hour, minute)
+
+                if hour > 23 or minute > 59:
+                    raise ValueError(f"Time out of range: {time_str}")
+
+                return hour * 60 + minute
 
         raise ValueError(f"Unable to parse time: {time_str}")
 
@@ -71,17 +148,17 @@ class PlaceHoursFilter:
         raise ValueError(f"Invalid day: {day_str}")
 
     def parse_hours_string(self, hours_str: str) -> List[tuple]:
-        """Parse a single day's hours string into time ranges."""
+        """Parse a single day's hours string into (start, end) minute ranges."""
         hours_str = hours_str.strip()
 
-        # Handle special cases
-        if "closed" in hours_str.lower():
+        # Handle special cases (casefold once instead of per check)
+        hours_folded = hours_str.casefold()
+        if "closed" in hours_folded:
             return []
-        if "24 hours" in hours_str.lower() or "open 24 hours" in hours_str.lower():
-            return [(time(0, 0), time(23, 59))]
+        if "24 hours" in hours_folded:
+            return [(0, 23 * 60 + 59)]
 
-        # Extract time ranges using regex
-        # Pattern matches: "6:00 AM – 2:00 PM" or "11:00 AM – 3:00 PM, 5:00 – 10:00 PM"
+        # Extract time ranges using the precompiled regex
         time_ranges = []
 
         # Split by comma for multiple ranges in one day
@@ -89,72 +166,200 @@ class PlaceHoursFilter:
 
         for range_str in ranges:
             # Find time patterns in the range
-            time_pattern = (
-                r"(\d{1,2}:\d{2}\s*(?:AM|PM)?)\s*[–-]\s*(\d{1,2}:\d{2}\s*(?:AM|PM)?)"
-            )
-            match = re.search(time_pattern, range_str)
+            match = TIME_RANGE_PATTERN.search(range_str)
 
             if match:
                 start_time_str = match.group(1)
                 end_time_str = match.group(2)
 
                 try:
-                    start_time = self.parse_time(start_time_str)
-                    end_time = self.parse_time(end_time_str)
-                    time_ranges.append((start_time, end_time))
+                    start_min = self.parse_time(start_time_str)
+                    end_min = self.parse_time(end_time_str)
+                    time_ranges.append((start_min, end_min))
                 except ValueError as e:
                     print(f"Warning: Could not parse time range '{range_str}': {e}")
                     continue
 
         return time_ranges
 
+    def build_hours_by_day(
+        self, hours: Optional[List[str]]
+    ) -> Dict[str, List[tuple]]:
+        """Parse a list of hours strings into a day-keyed table of time ranges."""
+        hours_by_day = {}
+        for hours_entry in hours or []:
+            day, sep, rest = hours_entry.partition(":")
+            if not sep or day not in DAY_INDEX:
+                continue
+            if day in hours_by_day:
+                # First entry for a day wins, matching the original
+                # first-match scan over the raw strings
+                continue
+            hours_by_day[day] = self.parse_hours_string(rest)
+        return hours_by_day
+
+    def preprocess_places(
+        self, places: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Return places with hours parsed once into a "hours_by_day" table."""
+        processed = []
+        for place in places:
+            place_copy = place.copy()
+            place_copy["hours_by_day"] = self.build_hours_by_day(place.get("hours"))
+            processed.append(place_copy)
+        return processed
+
     def is_place_open(
-        self, place: Dict[str, Any], query_time: time, query_day: str
+        self, place: Dict[str, Any], query_time: Union[time, int], query_day: str
     ) -> bool:
         """Check if a place is open at the given time and day."""
-        if "hours" not in place or not place["hours"]:
-            return False
-
-        # Find the hours for the requested day
-        day_hours = None
-        for hours_entry in place["hours"]:
-            if hours_entry.startswith(query_day + ":"):
-                day_hours = hours_entry
-                break
+        hours_by_day = place.get("hours_by_day")
+        if hours_by_day is None:
+            hours_by_day = self.build_hours_by_day(place.get("hours"))
 
-        if not day_hours:
+        # O(1) day lookup; all regex work happened when the table was built
+        time_ranges = hours_by_day.get(query_day)
+        if not time_ranges:
             return False
 
-        # Parse the hours for this day
-        time_ranges = self.parse_hours_string(day_hours)
-
-        # Check if query time falls within any of the time ranges
-        for start_time, end_time in time_ranges:
-            if start_time <= query_time <= end_time:
+        # Check if query time falls within any of the minute ranges
+        query_minutes = to_minutes(query_time)
+        for start_min, end_min in time_ranges:
+            if start_min <= query_minutes <= end_min:
                 return True
 
         return False
 
+    def build_index(self, places: List[Dict[str, Any]]) -> tuple:
+        """Flatten all hours into CSR-style arrays of per-range minute spans.
+
+        offsets[p]:offsets[p+1] delimits place p's entries, so each place's
+        ranges sit contiguously in day_idx/start/end.
+        """
+        offsets = [0]
+        day_idx = []
+        start = []
+        end = []
+
+        for place in places:
+            seen_days = set()
+            for hours_entry in place.get("hours") or []:
+                day, sep, rest = hours_entry.partition(":")
+                if not sep or day not in DAY_INDEX:
+                    continue
+                if day in seen_days:
+                    # First entry for a day wins (same as build_hours_by_day)
+                    continue
+                seen_days.add(day)
+                for start_min, end_min in self.parse_hours_string(rest):
+                    day_idx.append(DAY_INDEX[day])
+                    start.append(start_min)
+                    end.append(end_min)
+            offsets.append(len(day_idx))
+
+        return (
+            np.asarray(offsets, dtype=np.int64),
+            np.asarray(day_idx, dtype=np.int32),
+            np.asarray(start, dtype=np.int32),
+            np.asarray(end, dtype=np.int32),
+        )
+
+    def load_index(
+        self, places: List[Dict[str, Any]], json_path: str
+    ) -> tuple:
+        """Load the flattened hours index from a sidecar cache if it is fresh.
+
+        The cache lives next to the JSON file and is rebuilt whenever the JSON
+        file is newer, so repeat invocations skip all the regex parsing.
+        """
+        cache_path = json_path + ".hours.npz"
+        try:
+            if os.path.getmtime(cache_path) > os.path.getmtime(json_path):
+                cached = np.load(cache_path)
+                offsets = cached["offsets"]
+                # mtime alone can lie (cp -p, rsync with preserved times);
+                # the njit kernels index offsets unchecked, so make sure the
+                # cache matches this place count before trusting it
+                if offsets.shape[0] == len(places) + 1:
+                    return (
+                        offsets,
+                        cached["day_idx"],
+                        cached["start"],
+                        cached["end"],
+                    )
+        except Exception:
+            # missing/stale/corrupt cache: rebuild below. A truncated .npz
+            # (interrupted savez) raises BadZipFile/ValueError/EOFError, so
+            # anything short of rebuilding would wedge every later run.
+            pass
+
+        offsets, day_idx, start, end = self.build_index(places)
+        try:
+            np.savez(
+                cache_path,
+                offsets=offsets,
+                day_idx=day_idx,
+                start=start,
+                end=end,
+            )
+        except OSError:
+            pass  # cache dir not writable; still works, just slower next time
+        return offsets, day_idx, start, end
+
     def filter_open_places(
-        self, places: List[Dict[str, Any]], query_time: time, query_day: str
+        self,
+        places: List[Dict[str, Any]],
+        query_time: Union[time, int],
+        query_day: str,
+        json_path: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """Filter places to return only those open at the given time and day."""
-        open_places = []
+        if np is not None:
+            # All hours are parsed once up front; the scan itself is a compiled
+            # loop over flat int arrays rather than per-place regex work.
+            if json_path is not None:
+                offsets, day_idx, start, end = self.load_index(places, json_path)
+            else:
+                offsets, day_idx, start, end = self.build_index(places)
+            open_mask = np.zeros(len(places), dtype=np.bool_)
+            scan = (
+                _scan_open_places_parallel
+                if len(places) > PARALLEL_THRESHOLD
+                else _scan_open_places
+            )
+            scan(
+                offsets,
+                day_idx,
+                start,
+                end,
+                DAY_INDEX[query_day],
+                to_minutes(query_time),
+                open_mask,
+            )
+            is_open = open_mask.tolist()
+        else:
+            preprocessed = self.preprocess_places(places)
+            is_open = [
+                self.is_place_open(place, query_time, query_day)
+                for place in preprocessed
+            ]
 
-        for place in places:
-            if self.is_place_open(place, query_time, query_day):
-                # Create a copy of the place without the hours field
-                place_copy = place.copy()
-                place_copy.pop("hours", None)  # Remove hours field
-                open_places.append(place_copy)
+        open_places = []
+        for place, open_now in zip(places, is_open):
+            if open_now:
+                # Copy the place without the hours field in a single pass
+                open_places.append(
+                    {k: v for k, v in place.items() if k != "hours"}
+                )
 
         return open_places
 
     def load_places_from_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Load places from a JSON file."""
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
+            with open(file_path, "rb") as file:
+                raw = file.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
             if not data.get("success") or "places" not in data:
                 raise ValueError(
@@ -198,11 +403,15 @@ def main():
         places = filter_obj.load_places_from_file(args.file)
 
         # Filter open places
-        open_places = filter_obj.filter_open_places(places, query_time, query_day)
+        open_places = filter_obj.filter_open_places(
+            places, query_time, query_day, json_path=args.file
+        )
 
-        # Display results
+        # Display results (parse_time returns minutes since midnight)
+        query_time_display = time(query_time // 60, query_time % 60)
         print(
-            f"Checking places open on {query_day} at {query_time.strftime('%I:%M %p')}"
+            f"Checking places open on {query_day} at "
+            f"{query_time_display.strftime('%I:%M %p')}"
         )
         print(f"Total places: {len(places)}")
         print(f"Open places: {len(open_places)}")
@@ -235,15 +444,26 @@ def main():
         # Save to output file if specified
         if args.output:
             result = {
-                "query_time": query_time.strftime("%H:%M"),
+                "query_time": query_time_display.strftime("%H:%M"),
                 "query_day": query_day,
                 "total_places": len(places),
                 "open_places_count": len(open_places),
                 "open_places": open_places,
             }
 
-            with open(args.output, "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+            if orjson is not None:
+                with open(args.output, "wb") as f:
+                    f.write(
+                        orjson.dumps(
+                            result,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+                            default=str,
+                        )
+                    )
+            else:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+                    f.write("\n")
 
             print(f"\nResults saved to: {args.output}")
 
